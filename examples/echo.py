@@ -6,6 +6,10 @@ This demonstrates how audio can be streamed,
 written to a sink).
 
 To avoid feedback, this should be used with headphones.
+
+The echo loop runs with real-time priority if permitted
+(e.g. with CAP_SYS_NICE or a matching rtprio limit),
+which avoids dropouts on a busy system.
 """
 
 import pasimple
@@ -60,15 +64,14 @@ stream_play = pasimple.PaSimple(pasimple.PA_STREAM_PLAYBACK,
 print_stream_attrs(stream_play)
 
 # We want to echo the recorded audio with 1s delay,
-# so let's start by recording a second of audio.
-# This blocks until all audio (1s) has been read.
-print('Recording...')
-audio = stream_rec.read(BYTES_PER_SEC)
-# Then, we just add it to the playback buffer,
-# which returns immediately because tlength is
-# larger than 1s of audio. It will also start playing
-# immediately becuase we set prebuf to 1s.
-stream_play.write(audio)
+# so let's start by filling the playback buffer with
+# a second of silence. This returns immediately because
+# tlength is larger than 1s of audio. It will also start
+# playing immediately because we set prebuf to 1s.
+# Everything recorded from now on will be queued
+# behind the silence, i.e. played with 1s of delay,
+# without having to wait for a second of recording first.
+stream_play.write_silence(BYTES_PER_SEC)
 
 # Set up a signal handler, so we can gracefully
 # stop the following loop.
@@ -79,13 +82,32 @@ def sigint_handler(sig, frame):
     running = False
 signal.signal(signal.SIGINT, sigint_handler)
 
+# Ask for real-time scheduling, so the loop is woken
+# up promptly whenever a chunk has been recorded.
+try:
+    if not pasimple.PaSimple.set_realtime():
+        print('Real-time scheduling not permitted, using a lower nice value')
+except pasimple.PaSimpleError as err:
+    print(f'Running without elevated priority: {err}')
+
 # Keep reading and writing 200ms chunks of audio.
 # Since there is already 1s of audio in the playback
 # buffer, it will continue to be played delayed.
+# The same buffer is reused for every chunk, so no
+# memory is allocated or copied inside the loop.
+# If the recording clock runs slightly faster than
+# the playback clock, the playback buffer (and thus
+# the delay) would slowly grow. Once it exceeds 1.5s,
+# we drop the buffered audio and start over with 1s
+# of silence.
 print('Echoing (press Ctrl+C to interrupt)...')
+audio = bytearray(BYTES_PER_SEC // 5)
 while running:
-    audio = stream_rec.read(BYTES_PER_SEC // 5)
+    stream_rec.read_into(audio)
     stream_play.write(audio)
+    if stream_play.get_buffered_bytes() > BYTES_PER_SEC * 3 // 2:
+        stream_play.flush()
+        stream_play.write_silence(BYTES_PER_SEC)
 
 # We were interrupted, so all that's
 # left to do is cleaning things up.
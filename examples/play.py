@@ -3,14 +3,20 @@
 import wave
 import pasimple
 
-# Read a .wav file with its attributes
+# Open a .wav file and read its attributes
 with wave.open('recording.wav', 'rb') as wave_file:
     format = pasimple.width2format(wave_file.getsampwidth())
     channels = wave_file.getnchannels()
     sample_rate = wave_file.getframerate()
-    audio_data = wave_file.readframes(wave_file.getnframes())
 
-# Play the file via PulseAudio
-with pasimple.PaSimple(pasimple.PA_STREAM_PLAYBACK, format, channels, sample_rate) as pa:
-    pa.write(audio_data)
-    pa.drain()
+    # Play the file via PulseAudio. The audio data is
+    # read and played in chunks of 100ms, so the whole
+    # file never has to be kept in memory.
+    chunk_frames = max(1, sample_rate // 10)
+    with pasimple.PaSimple(pasimple.PA_STREAM_PLAYBACK, format, channels, sample_rate) as pa:
+        while True:
+            audio_data = wave_file.readframes(chunk_frames)
+            if not audio_data:
+                break
+            pa.write(audio_data)
+        pa.drain()
@@ -2,6 +2,9 @@
 PA_STREAM_PLAYBACK=1
 PA_STREAM_RECORD=2
 
+# Lets the server choose a buffer metric ((uint32_t) -1 in pa_buffer_attr)
+PA_BUFFER_ATTR_DEFAULT = 0xFFFFFFFF
+
 # Audio formats supported by pulseaudio are documented here:
 # https://www.freedesktop.org/wiki/Software/PulseAudio/Documentation/User/SupportedAudioFormats/
 PA_SAMPLE_U8 = 0            # Unsigned 8 Bit PCM
@@ -19,10 +22,6 @@ PA_SAMPLE_S24_32LE = 11     # Signed 24 Bit PCM in LSB of 32 Bit words, little e
 PA_SAMPLE_S24_32BE = 12     # Signed 24 Bit PCM in LSB of 32 Bit words, big endian
 
 
-from .exceptions import PaSimpleError
-from .pa_simple import PaSimple
-
-
 # Maps sample widths to their most common audio formats
 LOOKUP_FORMAT_BY_WIDTH = {
     1: PA_SAMPLE_U8,
@@ -60,6 +59,11 @@ def format2width(audio_format):
     return LOOKUP_WIDTH_BY_FORMAT[audio_format]
 
 
+from .exceptions import PaSimpleError
+from .pa_simple import PaSimple
+from .stream_group import StreamGroup
+
+
 import wave
 
 def play_wav(file_path):
@@ -75,7 +79,14 @@ def play_wav(file_path):
                       width2format(wf.getsampwidth()),
                       wf.getnchannels(),
                       wf.getframerate()) as pa:
-            pa.write(wf.readframes(wf.getnframes()))
+            # Stream the file in chunks of 100ms,
+            # instead of loading all of it into memory
+            chunk_frames = max(1, wf.getframerate() // 10)
+            while True:
+                audio_data = wf.readframes(chunk_frames)
+                if not audio_data:
+                    break
+                pa.write(audio_data)
             pa.drain()
 
 def record_wav(file_path, length, format=PA_SAMPLE_S24LE, channels=1, sample_rate=41000):
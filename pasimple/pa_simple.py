@@ -1,5 +1,7 @@
 import ctypes
-from pasimple import PaSimpleError, PA_STREAM_PLAYBACK, PA_STREAM_RECORD
+import os
+import pasimple
+from pasimple import PaSimpleError, PA_STREAM_RECORD, PA_BUFFER_ATTR_DEFAULT, format2width
 
 
 # The C library interface is stored in a global variable
@@ -10,13 +12,86 @@ def get_libpulse_simple():
     if _libpulse_simple is None:
         try:
             _libpulse_simple = ctypes.CDLL('libpulse-simple.so.0')
+            # Declare full prototypes, so arguments are converted
+            # and checked by ctypes before calling into the library.
+            # Calls through CDLL release the GIL while the (blocking)
+            # C functions are running.
+            error_ptr = ctypes.POINTER(ctypes.c_int)
+            _libpulse_simple.pa_simple_new.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_char_p, ctypes.POINTER(pa_sample_spec), ctypes.c_void_p, ctypes.POINTER(pa_buffer_attr), error_ptr]
             _libpulse_simple.pa_simple_new.restype = ctypes.c_void_p
+            _libpulse_simple.pa_simple_free.argtypes = [ctypes.c_void_p]
+            _libpulse_simple.pa_simple_free.restype = None
+            _libpulse_simple.pa_simple_read.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, error_ptr]
+            _libpulse_simple.pa_simple_read.restype = ctypes.c_int
+            _libpulse_simple.pa_simple_write.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, error_ptr]
+            _libpulse_simple.pa_simple_write.restype = ctypes.c_int
+            _libpulse_simple.pa_simple_drain.argtypes = [ctypes.c_void_p, error_ptr]
+            _libpulse_simple.pa_simple_drain.restype = ctypes.c_int
+            _libpulse_simple.pa_simple_flush.argtypes = [ctypes.c_void_p, error_ptr]
+            _libpulse_simple.pa_simple_flush.restype = ctypes.c_int
+            _libpulse_simple.pa_simple_get_latency.argtypes = [ctypes.c_void_p, error_ptr]
             _libpulse_simple.pa_simple_get_latency.restype = ctypes.c_uint64
         except OSError as err:
             raise PaSimpleError(f'{type(err)}: {err}')
     return _libpulse_simple
 
 
+# pa_simple_get_latency() returns (pa_usec_t) -1 on failure
+PA_USEC_INVALID = 0xFFFFFFFFFFFFFFFF
+
+
+# Maps audio formats to matching numpy dtypes (used by read_np)
+_NP_DTYPE = {
+    pasimple.PA_SAMPLE_U8: 'u1',
+    pasimple.PA_SAMPLE_S16LE: '<i2',
+    pasimple.PA_SAMPLE_S16BE: '>i2',
+    pasimple.PA_SAMPLE_FLOAT32LE: '<f4',
+    pasimple.PA_SAMPLE_FLOAT32BE: '>f4',
+    pasimple.PA_SAMPLE_S32LE: '<i4',
+    pasimple.PA_SAMPLE_S32BE: '>i4',
+    pasimple.PA_SAMPLE_S24_32LE: '<i4',
+    pasimple.PA_SAMPLE_S24_32BE: '>i4'
+}
+
+
+def _msec_to_bytes(msec, format, channels, rate):
+    """Returns the size of `msec` milliseconds of audio in bytes, rounded down to whole frames"""
+
+    return msec * rate // 1000 * channels * format2width(format)
+
+
+# Byte values encoding silence, for formats where it isn't 0x00
+_SILENCE_BYTE = {
+    pasimple.PA_SAMPLE_U8: 0x80,
+    pasimple.PA_SAMPLE_ALAW: 0xD5,
+    pasimple.PA_SAMPLE_ULAW: 0xFF
+}
+
+# Memory used by write_silence(), one buffer per silence byte value.
+# The library only reads from them, so they are shared by all streams.
+_SILENCE_SIZE = 1 << 16
+_silence_buffers = {}
+
+def _silence_buffer(format):
+    """Returns a shared buffer of silence for an audio format"""
+
+    silence_byte = _SILENCE_BYTE.get(format, 0x00)
+    buffer = _silence_buffers.get(silence_byte)
+    if buffer is None:
+        buffer = _silence_buffers[silence_byte] = bytes([silence_byte]) * _SILENCE_SIZE
+    return buffer
+
+
+def _closed_stream(*args, **kwargs):
+    raise PaSimpleError('Cannot perform operation on closed stream')
+
+def _not_recording(*args, **kwargs):
+    raise PaSimpleError('Stream was not initialized for recording')
+
+def _not_playback(*args, **kwargs):
+    raise PaSimpleError('Stream was not initialized for playback')
+
+
 class pa_sample_spec(ctypes.Structure):
     """Struct describing the audio encoding for the pulse server"""
 
@@ -40,9 +115,18 @@ class pa_buffer_attr(ctypes.Structure):
 
 
 class PaSimple:
+    # Operations that are unavailable for a stream's direction, or after the
+    # stream has been closed, are replaced by stubs raising an error.
+    # This way, the operations don't have to check the stream's state.
+    _RECORD_OPS = ('read', 'read_into', 'read_np', '_read_raw')
+    _PLAYBACK_OPS = ('write', 'write_raw', 'write_buffered', 'write_silence', 'drain')
+    _STREAM_OPS = _RECORD_OPS + _PLAYBACK_OPS + ('flush', 'get_latency', 'get_buffered_bytes')
+
     def __init__(self, direction, format, channels, rate, app_name='python',
                  stream_name=None, server_name=None, device_name=None,
-                 maxlength=-1, tlength=-1, prebuf=-1, minreq=-1, fragsize=-1):
+                 maxlength=PA_BUFFER_ATTR_DEFAULT, tlength=PA_BUFFER_ATTR_DEFAULT,
+                 prebuf=PA_BUFFER_ATTR_DEFAULT, minreq=PA_BUFFER_ATTR_DEFAULT,
+                 fragsize=PA_BUFFER_ATTR_DEFAULT, target_latency_ms=None):
         """Initialize a pulseaudio simple API stream.
 
         direction: either PA_STREAM_PLAYBACK or PA_STREAM_RECORD
@@ -54,12 +138,32 @@ class PaSimple:
         server_name: None (use default) or string specifying a pulseaudio server name
         device_name: None (use default) or string specifying a pulseaudio device
 
-        Buffer-related options are in units of bytes:
-        maxlength: integer buffer size limit, or -1 (default: max supported)
-        tlength: keep this many bytes in playback buffer, or -1 (default: about 2s)
-        prebuf: buffer this many bytes before starting playback, or -1 (default: ==tlength)
-        minreq: refill playback buffer in chunks at least this big, or -1 (default: about 2s)
-        fragsize: receive recorded audio in chunks of this size, or -1 (default: about 2s)
+        Buffer-related options are in units of bytes. PA_BUFFER_ATTR_DEFAULT
+        (or -1) lets the server choose a value:
+        maxlength: integer buffer size limit (default: max supported)
+        tlength: keep this many bytes in playback buffer (default: about 2s)
+        prebuf: buffer this many bytes before starting playback (default: ==tlength)
+        minreq: refill playback buffer in chunks at least this big (default: about 2s)
+        fragsize: receive recorded audio in chunks of this size (default: about 2s)
+        latency_target() can be used to compute tlength/fragsize for a latency.
+
+        target_latency_ms: None or integer latency in milliseconds to derive
+        the buffer options from: tlength and fragsize are set to this much
+        audio. maxlength is set to twice the larger of them, prebuf to tlength
+        and minreq to a quarter of tlength. Buffer options that are given
+        explicitly take precedence and are used to derive the others.
+
+        write_buffered() collects data until at least minreq bytes are
+        available (or 20ms of audio, if minreq is chosen by the server).
+
+        The simple API connects streams with PA_STREAM_ADJUST_LATENCY, so the
+        server configures the device buffers accordingly: tlength (playback)
+        and fragsize (record) bound the total latency, not just the size of
+        the server-side buffer.
+
+        Reading from or writing to a stream must not be done from more
+        than one thread at once. drain(), flush() and get_latency() may
+        be called while another thread reads or writes.
         """
 
         # Save audio encoding properties
@@ -74,6 +178,26 @@ class PaSimple:
 
         # Prepare arguments for initializing a pulseaudio stream
         sample_spec = pa_sample_spec(format, rate, channels)
+        # -1 is accepted as an alias for PA_BUFFER_ATTR_DEFAULT
+        maxlength, tlength, prebuf, minreq, fragsize = (
+            PA_BUFFER_ATTR_DEFAULT if value == -1 else value
+            for value in (maxlength, tlength, prebuf, minreq, fragsize))
+        self._target_latency_ms = target_latency_ms
+        if target_latency_ms is not None:
+            frame_size = channels * format2width(format)
+            target_bytes = _msec_to_bytes(target_latency_ms, format, channels, rate)
+            if tlength == PA_BUFFER_ATTR_DEFAULT:
+                tlength = target_bytes
+            if fragsize == PA_BUFFER_ATTR_DEFAULT:
+                fragsize = target_bytes
+            # Derive the remaining playback metrics from the effective tlength,
+            # so an explicit tlength isn't capped by a smaller derived maxlength
+            if maxlength == PA_BUFFER_ATTR_DEFAULT:
+                maxlength = max(tlength, fragsize) * 2
+            if prebuf == PA_BUFFER_ATTR_DEFAULT:
+                prebuf = tlength
+            if minreq == PA_BUFFER_ATTR_DEFAULT:
+                minreq = tlength // frame_size // 4 * frame_size
         buffer_attr = pa_buffer_attr(maxlength, tlength, prebuf, minreq, fragsize)
         arg_server_name = ctypes.c_char_p(server_name.encode()) if server_name is not None else None
         arg_app_name = ctypes.c_char_p(app_name.encode())
@@ -81,21 +205,144 @@ class PaSimple:
         arg_stream_name = ctypes.c_char_p(stream_name.encode())
         error = ctypes.c_int(0)
 
+        # Bind the library functions used by this stream,
+        # so they don't have to be looked up on every call
+        lib = get_libpulse_simple()
+        self._pa_free = lib.pa_simple_free
+        self._pa_read = lib.pa_simple_read
+        self._pa_write = lib.pa_simple_write
+        self._pa_drain = lib.pa_simple_drain
+        self._pa_flush = lib.pa_simple_flush
+        self._pa_get_latency = lib.pa_simple_get_latency
+
         # Initialize the stream.
         # Keep track of the underlying stream's state to avoid double frees
         self._stream_alive = False
-        self._stream = get_libpulse_simple().pa_simple_new(arg_server_name, arg_app_name, direction, arg_device_name, arg_stream_name, ctypes.byref(sample_spec), None, ctypes.byref(buffer_attr), ctypes.byref(error))
+        self._stream = lib.pa_simple_new(arg_server_name, arg_app_name, direction, arg_device_name, arg_stream_name, ctypes.byref(sample_spec), None, ctypes.byref(buffer_attr), ctypes.byref(error))
         if self._stream is None:
             raise PaSimpleError(f'Error while creating stream: {error.value}')
+        self._stream_vp = ctypes.c_void_p(self._stream)
+        # The error out-parameter is reused by the read/write functions,
+        # so calls don't need to allocate and wrap a new one. Other
+        # operations use their own, as they may be called from another
+        # thread while a write is in progress (see StreamGroup).
+        self._error = error
+        self._error_ref = ctypes.byref(error)
         self._stream_alive = True
+        if direction == PA_STREAM_RECORD:
+            self._replace_ops(self._PLAYBACK_OPS, _not_playback)
+        else:
+            self._replace_ops(self._RECORD_OPS, _not_recording)
+        self._specialize_ops()
+
+        # Buffer used by read(), grown to the largest size requested
+        self._read_buffer = (ctypes.c_char * 0)()
+
+        # Data collected by write_buffered() until the threshold is reached
+        self._write_buffer = bytearray()
+        if 0 < minreq < PA_BUFFER_ATTR_DEFAULT:
+            self._write_threshold = minreq
+        else:
+            self._write_threshold = rate * channels * format2width(format) // 50
+
+
+    @staticmethod
+    def latency_target(msec, format, channels, rate):
+        """Get buffer options for a latency of `msec` milliseconds.
+
+        Returns a dict with `tlength` and `fragsize` set to the size of
+        `msec` milliseconds of audio, which can be passed to the constructor
+        as keyword arguments. Only the option matching the stream direction
+        is used by the server. All other options are left to the server.
+        """
+
+        num_bytes = _msec_to_bytes(msec, format, channels, rate)
+        return {'tlength': num_bytes, 'fragsize': num_bytes}
+
+
+    @staticmethod
+    def set_realtime(priority=50):
+        """Run the calling thread with real-time priority.
+
+        Tries to switch the thread to SCHED_FIFO with `priority` and
+        returns True on success. If that isn't permitted (e.g. without
+        CAP_SYS_NICE), falls back to lowering the thread's nice value by
+        20 and returns False. Raises a PaSimpleError if both fail.
+        """
+
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            return True
+        except (AttributeError, OSError):
+            pass
+        try:
+            os.nice(-20)
+            return False
+        except OSError as err:
+            raise PaSimpleError(f'Could not raise scheduling priority: {err}')
 
 
     def close(self):
         """Close the underlying stream and free resources"""
 
         if self._stream_alive:
-            self._stream_alive = False
-            get_libpulse_simple().pa_simple_free(ctypes.c_void_p(self._stream))
+            try:
+                self._flush_write_buffer()
+            finally:
+                self._stream_alive = False
+                self._replace_ops(self._STREAM_OPS, _closed_stream)
+                # Methods bound before closing may still be called, so make
+                # sure they raise instead of using the freed stream
+                stream_vp = self._stream_vp
+                self._stream_vp = None
+                self._pa_read = self._pa_write = _closed_stream
+                self._pa_drain = self._pa_flush = self._pa_get_latency = _closed_stream
+                self._close_specialized_ops()
+                self._pa_free(stream_vp)
+
+
+    def _replace_ops(self, names, stub):
+        """Replace the operations in `names` with `stub` for this instance"""
+
+        for name in names:
+            setattr(self, name, stub)
+
+
+    def _specialize_ops(self):
+        """Override the per-chunk read/write calls with closures for this stream.
+
+        The closures capture the library function, stream pointer and error
+        out-parameter, so they don't look them up on every call. They don't
+        reference the instance, which keeps reference cycles out.
+        _close_specialized_ops() rebinds the captured library functions to
+        the closed-stream stub, so closures bound before close() raise.
+        """
+
+        stream_vp = self._stream_vp
+        error = self._error
+        error_ref = self._error_ref
+        pa_read = self._pa_read
+        pa_write = self._pa_write
+
+        def read_raw(ptr, num_bytes):
+            if pa_read(stream_vp, ptr, num_bytes, error_ref) != 0:
+                raise PaSimpleError(f'Could not record audio, error code: {error.value}')
+
+        def write_raw(ptr, num_bytes):
+            if pa_write(stream_vp, ptr, num_bytes, error_ref) != 0:
+                raise PaSimpleError(f'Could not play audio, error code: {error.value}')
+
+        def close_ops():
+            nonlocal pa_read, pa_write
+            pa_read = pa_write = _closed_stream
+
+        if self._direction == PA_STREAM_RECORD:
+            read_raw.__doc__ = PaSimple._read_raw.__doc__
+            self._read_raw = read_raw
+        else:
+            write_raw.__doc__ = PaSimple.write_raw.__doc__
+            self.write_raw = write_raw
+        self._close_specialized_ops = close_ops
     
 
     def __enter__(self):
@@ -134,6 +381,20 @@ class PaSimple:
         return self._rate
 
 
+    def requested_vs_actual(self):
+        """Get the requested and the current latency.
+
+        Returns a tuple (requested, actual) in microseconds. `requested` is
+        None if no target_latency_ms was specified in the constructor.
+        `actual` is the latency reported by get_latency() at the time of the
+        call. For playback streams, call this once audio has been queued,
+        so it reflects the buffers the server actually chose.
+        """
+
+        requested = self._target_latency_ms * 1000 if self._target_latency_ms is not None else None
+        return requested, self.get_latency()
+
+
     def read(self, num_bytes):
         """Record data from the PulseAudio server.
 
@@ -141,18 +402,58 @@ class PaSimple:
         This function blocks and returns `num_bytes` number of bytes.
         """
 
-        if not self._stream_alive:
-            raise PaSimpleError('Cannot perform operation on closed stream')
-        if self._direction != PA_STREAM_RECORD:
-            raise PaSimpleError('Stream was not initialized for recording')
-        
-        rec_buffer = bytearray(num_bytes)
-        rec_buffer_ptr = ctypes.c_char * num_bytes
-        error = ctypes.c_int(0)
-        ok = get_libpulse_simple().pa_simple_read(ctypes.c_void_p(self._stream), rec_buffer_ptr.from_buffer(rec_buffer), num_bytes, ctypes.byref(error))
+        # Record into a buffer kept by the stream, which only grows when
+        # needed, and copy the result into a bytes object once.
+        if num_bytes > len(self._read_buffer):
+            self._read_buffer = (ctypes.c_char * num_bytes)()
+        self._read_raw(self._read_buffer, num_bytes)
+        return ctypes.string_at(self._read_buffer, num_bytes)
+
+
+    def read_into(self, buffer):
+        """Record data from the PulseAudio server into a preallocated buffer.
+
+        PA_STREAM_RECORD must be used during initialization.
+        `buffer` must be a writable bytes-like object (e.g. a bytearray).
+        This function blocks until the whole buffer has been filled
+        and returns the number of bytes read.
+        """
+
+        rec_buffer = memoryview(buffer).cast('B')
+        num_bytes = len(rec_buffer)
+        self._read_raw((ctypes.c_char * num_bytes).from_buffer(rec_buffer), num_bytes)
+        return num_bytes
+
+
+    def _read_raw(self, ptr, num_bytes):
+        """Record `num_bytes` of audio into the memory located at `ptr`"""
+
+        # Overridden per stream by a closure from _specialize_ops()
+        ok = self._pa_read(self._stream_vp, ptr, num_bytes, self._error_ref)
         if ok != 0:
-            raise PaSimpleError(f'Could not record audio, error code: {error.value}')
-        return bytes(rec_buffer)
+            raise PaSimpleError(f'Could not record audio, error code: {self._error.value}')
+
+
+    def read_np(self, num_frames):
+        """Record data from the PulseAudio server into a numpy array.
+
+        PA_STREAM_RECORD must be used during initialization.
+        This function blocks and returns an array with shape
+        (num_frames, channels), whose dtype matches the stream's format.
+        Requires numpy. Not supported for PA_SAMPLE_ALAW, PA_SAMPLE_ULAW,
+        PA_SAMPLE_S24LE and PA_SAMPLE_S24BE.
+        """
+
+        try:
+            import numpy
+        except ImportError as err:
+            raise PaSimpleError(f'read_np() requires numpy: {err}')
+        if self._format not in _NP_DTYPE:
+            raise PaSimpleError(f'Audio format {self._format} has no matching numpy dtype')
+
+        rec_array = numpy.empty((num_frames, self._channels), dtype=_NP_DTYPE[self._format])
+        self.read_into(rec_array)
+        return rec_array
 
 
     def write(self, data):
@@ -160,41 +461,111 @@ class PaSimple:
 
         PA_STREAM_PLAYBACK must be used during initialization.
         Encoding of `data` must match the one specified in the constructor.
+        `data` can be any bytes-like object. Writable buffers (e.g. a
+        bytearray filled by read_into()) are passed without copying.
+        Data collected by write_buffered() is written first.
         """
 
-        if not self._stream_alive:
-            raise PaSimpleError('Cannot perform operation on closed stream')
-        if self._direction != PA_STREAM_PLAYBACK:
-            raise PaSimpleError('Stream was not initialized for playback')
-        
-        error = ctypes.c_int(0)
-        ok = get_libpulse_simple().pa_simple_write(ctypes.c_void_p(self._stream), data, len(data), ctypes.byref(error))
+        if self._write_buffer:
+            self._flush_write_buffer()
+        if isinstance(data, bytes):
+            self.write_raw(data, len(data))
+            return
+
+        play_buffer = memoryview(data).cast('B')
+        num_bytes = len(play_buffer)
+        if play_buffer.readonly:
+            # ctypes can only wrap writable buffers, so copy read-only ones
+            self.write_raw(play_buffer.tobytes(), num_bytes)
+        else:
+            self.write_raw((ctypes.c_char * num_bytes).from_buffer(play_buffer), num_bytes)
+
+
+    def write_raw(self, ptr, num_bytes):
+        """Play `num_bytes` of audio located at `ptr` via the PulseAudio server.
+
+        PA_STREAM_PLAYBACK must be used during initialization.
+        `ptr` can be an address (integer or ctypes.c_void_p), a ctypes
+        array or a bytes object. It is passed to the library as is.
+        Unlike write(), this doesn't write data collected by
+        write_buffered() first.
+        """
+
+        # Overridden per stream by a closure from _specialize_ops()
+        ok = self._pa_write(self._stream_vp, ptr, num_bytes, self._error_ref)
         if ok != 0:
-            raise PaSimpleError(f'Could not play audio, error code: {error.value}')
+            raise PaSimpleError(f'Could not play audio, error code: {self._error.value}')
+
+
+    def write_silence(self, num_bytes):
+        """Play `num_bytes` of silence via the PulseAudio server.
+
+        PA_STREAM_PLAYBACK must be used during initialization.
+        No buffer is allocated for the silence, a buffer matching
+        the stream's format is shared between all streams.
+        Data collected by write_buffered() is written first.
+        """
+
+        if self._write_buffer:
+            self._flush_write_buffer()
+        # Write full frames only, the remainder is written last
+        silence = _silence_buffer(self._format)
+        frame_size = self._channels * format2width(self._format)
+        chunk_size = len(silence) - len(silence) % frame_size
+        while num_bytes > chunk_size:
+            self.write_raw(silence, chunk_size)
+            num_bytes -= chunk_size
+        self.write_raw(silence, num_bytes)
+
+
+    def write_buffered(self, data, flush=False):
+        """Play audio via the PulseAudio server, coalescing small writes.
+
+        PA_STREAM_PLAYBACK must be used during initialization.
+        Data is collected until the write threshold is reached (see the
+        constructor) and then passed to the server at once.
+        If `flush` is True, all collected data is written immediately.
+        write() and write_silence() write the collected data first,
+        write_raw() doesn't, so mixing it with write_buffered() can play
+        audio out of order.
+        """
+
+        self._write_buffer += data
+        if flush or len(self._write_buffer) >= self._write_threshold:
+            self._flush_write_buffer()
+
+
+    def _flush_write_buffer(self):
+        """Write any data collected by write_buffered() to the server"""
+
+        if not self._write_buffer:
+            return
+        # Swap in a new buffer instead of clearing the old one,
+        # because write() keeps it exported while playing it
+        data, self._write_buffer = self._write_buffer, bytearray()
+        self.write(data)
 
 
     def drain(self):
         """Blocks until all remaining data in the buffer has been played"""
 
-        if not self._stream_alive:
-            raise PaSimpleError('Cannot perform operation on closed stream')
-        if self._direction != PA_STREAM_PLAYBACK:
-            raise PaSimpleError('Stream was not initialized for playback')
-        
+        self._flush_write_buffer()
         error = ctypes.c_int(0)
-        ok = get_libpulse_simple().pa_simple_drain(ctypes.c_void_p(self._stream), ctypes.byref(error))
+        ok = self._pa_drain(self._stream_vp, ctypes.byref(error))
         if ok != 0:
             raise PaSimpleError(f'Could not drain, error code: {error.value}')
 
 
     def flush(self):
-        """Discards any data in the record/playback buffers"""
+        """Discards any data in the record/playback buffers.
+
+        This includes data collected by write_buffered() that
+        hasn't been written to the server yet.
+        """
 
-        if not self._stream_alive:
-            raise PaSimpleError('Cannot perform operation on closed stream')
-        
+        self._write_buffer.clear()
         error = ctypes.c_int(0)
-        ok = get_libpulse_simple().pa_simple_flush(ctypes.c_void_p(self._stream), ctypes.byref(error))
+        ok = self._pa_flush(self._stream_vp, ctypes.byref(error))
         if ok != 0:
             raise PaSimpleError(f'Could not flush, error code: {error.value}')
 
@@ -202,11 +573,18 @@ class PaSimple:
     def get_latency(self):
         """Get the record/playback latency reported by PulseAudio in microseconds"""
 
-        if not self._stream_alive:
-            raise PaSimpleError('Cannot perform operation on closed stream')
-        
         error = ctypes.c_int(0)
-        latency = get_libpulse_simple().pa_simple_get_latency(ctypes.c_void_p(self._stream), ctypes.byref(error))
-        if error.value != 0:
+        latency = self._pa_get_latency(self._stream_vp, ctypes.byref(error))
+        if latency == PA_USEC_INVALID:
             raise PaSimpleError(f'Could not get latency, error code: {error.value}')
         return latency
+
+
+    def get_buffered_bytes(self):
+        """Get the amount of audio corresponding to the current latency in bytes.
+
+        For playback streams, this approximates how much data is queued
+        and not played yet. The result is rounded down to whole frames.
+        """
+
+        return self.get_latency() * self._rate // 1000000 * self._channels * format2width(self._format)
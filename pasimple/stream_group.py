@@ -0,0 +1,75 @@
+import concurrent.futures
+
+
+class StreamGroup:
+    def __init__(self):
+        """Initialize a group for writing to multiple streams concurrently.
+
+        Each stream gets its own worker thread, so blocking writes to
+        different streams overlap, while writes to the same stream are
+        still played in the order they were submitted.
+
+        Streams must not be closed while writes to them are still running,
+        i.e. before wait_all() or close() of the group has returned. While
+        writes are pending, the streams must not be written to directly.
+        """
+
+        self._executors = {}
+        self._pending = []
+
+
+    def close(self):
+        """Wait for all submitted writes and stop the worker threads"""
+
+        try:
+            self.wait_all()
+        finally:
+            for executor in self._executors.values():
+                executor.shutdown()
+            self._executors.clear()
+
+
+    def __enter__(self):
+        """Context manager - enter"""
+
+        return self
+
+
+    def __exit__(self, type, value, traceback):
+        """Context manager - exit"""
+
+        self.close()
+
+
+    def submit(self, stream, data):
+        """Write `data` to `stream` in the background.
+
+        `stream` must be a PaSimple playback stream.
+        `data` must not be modified until the write has completed.
+        Returns a concurrent.futures.Future for the write.
+        """
+
+        # Forget writes that completed successfully, so the list doesn't
+        # grow while streaming. Failed ones are kept for wait_all().
+        self._pending = [future for future in self._pending
+                         if not future.done() or future.exception() is not None]
+
+        executor = self._executors.get(stream)
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            self._executors[stream] = executor
+        future = executor.submit(stream.write, data)
+        self._pending.append(future)
+        return future
+
+
+    def wait_all(self):
+        """Block until all submitted writes have completed.
+
+        Raises the first error that occurred in any of the writes.
+        """
+
+        pending, self._pending = self._pending, []
+        concurrent.futures.wait(pending)
+        for future in pending:
+            future.result()